@@ -5,6 +5,8 @@ import sys
 
 import structlog
 
+_configured: bool = False
+
 
 def configure_logging(
     level: str = "INFO",
@@ -55,7 +57,8 @@ def configure_logging(
         processors=[*shared_processors, final_processor],
         wrapper_class=structlog.stdlib.BoundLogger,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
+        # Resolve the configuration on every call so module-level loggers follow later reconfiguration
+        cache_logger_on_first_use=False,
     )
 
     # Configure standard library logging to use structlog formatting
@@ -85,6 +88,19 @@ def configure_logging(
     root_logger.addHandler(handler)
     root_logger.setLevel(getattr(logging, level.upper()))
 
+    global _configured
+    _configured = True
+
+
+def ensure_logging_configured() -> None:
+    """Configure logging with the default settings unless it has already been configured.
+
+    Entry points call this instead of relying on import-time side effects, so importing
+    the library never installs handlers and an explicit configure_logging() call wins.
+    """
+    if not _configured:
+        configure_logging()
+
 
 def get_logger(name: str = __name__) -> structlog.stdlib.BoundLogger:
     """Get a configured logger instance.
@@ -96,7 +112,3 @@ def get_logger(name: str = __name__) -> structlog.stdlib.BoundLogger:
         Configured structlog logger
     """
     return structlog.get_logger(name)
-
-
-# Configure logging on import with sensible defaults
-configure_logging()
@@ -1,4 +1,9 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from enum import Enum
+import hashlib
+import io
+import itertools
+import json
 from pathlib import Path
 import re
 from typing import Any
@@ -6,8 +11,17 @@ from typing import Any
 import geopandas as gpd
 import httpx
 import pandas as pd  # pyright: ignore[reportMissingTypeStubs]
+import shapely  # pyright: ignore[reportMissingTypeStubs]
 
-from core.logging import get_logger
+from core.logging import ensure_logging_configured, get_logger
+
+logger = get_logger(__name__)
+
+# On-disk copies of fetched GeoJSON, revalidated against the server on each run
+_HTTP_CACHE_DIR: Path = Path(".cache") / "http"
+
+# Line labels inside the JSON-like 'lines' property (e.g. "label": "U5")
+_LABEL_RE: re.Pattern[str] = re.compile(r'"label":\s*"([^"]+)"')
 
 
 def extract_line_name(row: pd.Series) -> str:
@@ -34,7 +48,7 @@ def extract_line_name(row: pd.Series) -> str:
         if pd.notna(lines_value):
             lines_str: str = str(lines_value)  # pyright: ignore[reportUnknownArgumentType]
             # Extract labels from lines data (e.g., "U5", "S1")
-            labels: list[str] = re.findall(r'"label":\s*"([^"]+)"', lines_str)
+            labels: list[str] = _LABEL_RE.findall(lines_str)
             if labels:
                 return labels[0].strip()  # Return first label only
 
@@ -42,6 +56,108 @@ def extract_line_name(row: pd.Series) -> str:
     return "Unknown Line"
 
 
+def extract_line_names(lines_df: pd.DataFrame) -> pd.Series:
+    """Vectorized counterpart of extract_line_name for a whole DataFrame of features.
+
+    Args:
+        lines_df: DataFrame containing feature properties (dbg_lines and/or lines columns)
+
+    Returns:
+        Series of single line names aligned with lines_df, "Unknown Line" where none can be found
+    """
+    names: pd.Series = pd.Series("Unknown Line", index=lines_df.index, dtype=object)
+    has_dbg_lines: pd.Series = pd.Series(data=False, index=lines_df.index)
+
+    # First try dbg_lines (contains readable names like "U5", "S1")
+    if "dbg_lines" in lines_df.columns:
+        dbg_lines: pd.Series = lines_df["dbg_lines"]
+        dbg_lines_str: pd.Series = dbg_lines.astype(str)
+        has_dbg_lines = dbg_lines.notna() & (dbg_lines_str != "") & (dbg_lines_str != "nan")
+        first_names: pd.Series = dbg_lines_str.str.split(",", n=1).str[0].str.strip()
+        names = names.mask(has_dbg_lines, first_names)
+
+    # Fall back to the first label in the 'lines' field for rows without dbg_lines
+    if "lines" in lines_df.columns:
+        lines_col: pd.Series = lines_df["lines"]
+        labels: pd.Series = lines_col.astype(str).str.extract(_LABEL_RE, expand=False).str.strip()
+        names = names.mask(~has_dbg_lines & lines_col.notna() & labels.notna(), labels)
+
+    return names
+
+
+def _get_geojson_response(
+    client: httpx.Client, url: str, timeout: float, conditional_headers: dict[str, str] | None = None
+) -> httpx.Response:
+    """Issue the GET request for a GeoJSON URL and raise on HTTP errors.
+
+    A 304 Not Modified answer to a conditional request is returned as-is instead of raising.
+    """
+    headers: dict[str, str] = {}
+
+    # Add User-Agent for OpenStreetMap/Nominatim requests
+    if "nominatim.openstreetmap.org" in url:
+        headers["User-Agent"] = "jet-lag-munich/0.1.0 (https://github.com/cameronbrill/jet-lag-munich)"
+
+    if conditional_headers:
+        headers.update(conditional_headers)
+
+    response = client.get(url, timeout=timeout, headers=headers)
+    if conditional_headers and response.status_code == httpx.codes.NOT_MODIFIED:
+        return response
+    response.raise_for_status()
+    return response
+
+
+def _read_cached_validators(validators_path: Path) -> dict[str, str]:
+    """Load stored ETag/Last-Modified validators, treating an unreadable file as a cache miss."""
+    try:
+        cached_validators: Any = json.loads(validators_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable GeoJSON cache metadata", cache_file=str(validators_path), error=str(e))
+        return {}
+
+    if not isinstance(cached_validators, dict):
+        logger.warning("Ignoring malformed GeoJSON cache metadata", cache_file=str(validators_path))
+        return {}
+    return {key: value for key, value in cached_validators.items() if isinstance(value, str)}  # pyright: ignore[reportUnknownVariableType]
+
+
+def _fetch_with_revalidation(client: httpx.Client, url: str, timeout: float, cache_dir: Path) -> bytes:
+    """Fetch GeoJSON bytes, revalidating a previously cached copy via ETag/Last-Modified."""
+    cache_key: str = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    body_path: Path = cache_dir / f"{cache_key}.geojson"
+    validators_path: Path = cache_dir / f"{cache_key}.json"
+
+    conditional_headers: dict[str, str] = {}
+    if body_path.exists() and validators_path.exists():
+        cached_validators: dict[str, str] = _read_cached_validators(validators_path)
+        if "etag" in cached_validators:
+            conditional_headers["If-None-Match"] = cached_validators["etag"]
+        if "last_modified" in cached_validators:
+            conditional_headers["If-Modified-Since"] = cached_validators["last_modified"]
+
+    response = _get_geojson_response(client, url, timeout, conditional_headers)
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        logger.debug("Reusing cached GeoJSON", url=url, cache_file=str(body_path))
+        return body_path.read_bytes()
+
+    # Only cache responses the server lets us revalidate
+    validators: dict[str, str] = {}
+    if "ETag" in response.headers:
+        validators["etag"] = response.headers["ETag"]
+    if "Last-Modified" in response.headers:
+        validators["last_modified"] = response.headers["Last-Modified"]
+
+    if validators:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Drop the old validators first so a partially written body is never revalidated
+        validators_path.unlink(missing_ok=True)
+        body_path.write_bytes(response.content)
+        validators_path.write_text(json.dumps(validators), encoding="utf-8")
+
+    return response.content
+
+
 def fetch_geojson_data(url: str, timeout: float = 30.0) -> str:
     """Fetch GeoJSON data from a URL.
 
@@ -56,29 +172,56 @@ def fetch_geojson_data(url: str, timeout: float = 30.0) -> str:
         httpx.RequestError: For network errors
         httpx.HTTPStatusError: For HTTP errors
     """
-    headers: dict[str, str] = {}
+    with httpx.Client() as client:
+        return _get_geojson_response(client, url, timeout).text
 
-    # Add User-Agent for OpenStreetMap/Nominatim requests
-    if "nominatim.openstreetmap.org" in url:
-        headers["User-Agent"] = "jet-lag-munich/0.1.0 (https://github.com/cameronbrill/jet-lag-munich)"
 
-    with httpx.Client() as client:
-        response = client.get(url, timeout=timeout, headers=headers)
-        response.raise_for_status()
-        return response.text
+def fetch_geojson_bytes(
+    url: str, timeout: float = 30.0, client: httpx.Client | None = None, cache_dir: Path | None = None
+) -> bytes:
+    """Fetch raw GeoJSON bytes from a URL without decoding them to text.
 
+    Args:
+        url: URL to fetch GeoJSON from
+        timeout: Request timeout in seconds
+        client: Shared HTTP client to reuse pooled connections; a short-lived client is created if omitted
+        cache_dir: Directory for an on-disk copy that is revalidated with ETag/Last-Modified on later calls
 
-def separate_geometries(gdf: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+    Returns:
+        GeoJSON data as bytes, ready to hand to GeoPandas as an in-memory buffer
+
+    Raises:
+        httpx.RequestError: For network errors
+        httpx.HTTPStatusError: For HTTP errors
+    """
+    if client is None:
+        with httpx.Client() as owned_client:
+            return fetch_geojson_bytes(url, timeout, owned_client, cache_dir)
+
+    if cache_dir is None:
+        return _get_geojson_response(client, url, timeout).content
+    return _fetch_with_revalidation(client, url, timeout, cache_dir)
+
+
+def separate_geometries(
+    gdf: gpd.GeoDataFrame, geom_types: pd.Series | None = None
+) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     """Separate GeoDataFrame into points and lines.
 
     Args:
         gdf: GeoDataFrame containing mixed geometry types
+        geom_types: Precomputed gdf.geometry.geom_type to reuse; computed here if omitted
 
     Returns:
         Tuple of (points_gdf, lines_gdf)
     """
-    points_gdf: gpd.GeoDataFrame = gdf[gdf.geometry.geom_type == "Point"].copy()  # pyright: ignore[reportAssignmentType]
-    lines_gdf: gpd.GeoDataFrame = gdf[gdf.geometry.geom_type == "LineString"].copy()  # pyright: ignore[reportAssignmentType]
+    if geom_types is None:
+        geom_types = gdf.geometry.geom_type
+
+    # Boolean selection already yields new frames, so no extra copy is needed
+    type_names = geom_types.to_numpy()
+    points_gdf: gpd.GeoDataFrame = gdf[type_names == "Point"]  # pyright: ignore[reportAssignmentType]
+    lines_gdf: gpd.GeoDataFrame = gdf[type_names == "LineString"]  # pyright: ignore[reportAssignmentType]
     return points_gdf, lines_gdf
 
 
@@ -91,40 +234,40 @@ def extract_boundary_polygon(boundary_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame
     Returns:
         GeoDataFrame with Polygon geometry for Google My Maps area tinting
     """
+    geometries = boundary_gdf.geometry.to_numpy()
+    geom_types: pd.Series = boundary_gdf.geometry.geom_type
+    type_ids = shapely.get_type_id(geometries)  # pyright: ignore[reportUnknownMemberType]
+    is_polygon = type_ids == shapely.GeometryType.POLYGON
+    is_multipolygon = type_ids == shapely.GeometryType.MULTIPOLYGON
+    keep = is_polygon | is_multipolygon
+
+    # Skip non-polygon geometries
+    for skipped_type in geom_types[~keep]:
+        logger.debug("Skipping non-polygon geometry", geom_type=skipped_type)
+
+    if keep.any():
+        # Keep polygons as-is for Google My Maps tinting; for multipolygons keep only the largest part
+        boundary_polygons = geometries.copy()
+        if is_multipolygon.any():
+            parts, part_owner = shapely.get_parts(geometries[is_multipolygon], return_index=True)  # pyright: ignore[reportUnknownMemberType,reportUnknownVariableType]
+            largest_parts: pd.Series = pd.Series(shapely.area(parts)).groupby(part_owner).idxmax()  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
+            boundary_polygons[is_multipolygon] = parts[largest_parts.to_numpy()]
+
+        boundary_polygon_gdf: gpd.GeoDataFrame = boundary_gdf[keep].assign(name="Munich Boundary")  # pyright: ignore[reportAssignmentType]
+        boundary_polygon_gdf[boundary_polygon_gdf.geometry.name] = boundary_polygons[keep]
+
+        boundary_points = shapely.get_num_points(shapely.get_exterior_ring(boundary_polygons[keep]))  # pyright: ignore[reportUnknownMemberType]
+        areas = shapely.area(boundary_polygons[keep])  # pyright: ignore[reportUnknownMemberType]
+        for geom_type, points_count, area in zip(geom_types[keep], boundary_points, areas, strict=True):
+            logger.info(
+                "Extracted boundary polygon",
+                geom_type=geom_type,
+                boundary_points=int(points_count),
+                area=float(area),
+            )
 
-    logger = get_logger(__name__)
-    boundary_lines: list[pd.Series] = []
-
-    for _idx, row in boundary_gdf.iterrows():
-        geom: Any = row.geometry
-        boundary_polygon: Any
-
-        if geom.geom_type == "Polygon":
-            # Keep the polygon as-is for Google My Maps tinting
-            boundary_polygon = geom
-        elif geom.geom_type == "MultiPolygon":
-            # Find the largest polygon and keep it as a polygon
-            boundary_polygon = max(geom.geoms, key=lambda p: p.area)  # pyright: ignore[reportUnknownArgumentType,reportUnknownLambdaType,reportUnknownMemberType]
-        else:
-            # Skip non-polygon geometries
-            logger.debug("Skipping non-polygon geometry", geom_type=geom.geom_type)
-            continue
-
-        # Create new row with boundary polygon
-        new_row: pd.Series = row.copy()
-        new_row.geometry = boundary_polygon
-        new_row["name"] = "Munich Boundary"
-        boundary_lines.append(new_row)
-
-        logger.info(
-            "Extracted boundary polygon",
-            geom_type=geom.geom_type,
-            boundary_points=len(boundary_polygon.exterior.coords),  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType,reportUnknownVariableType]
-            area=boundary_polygon.area,
-        )
+        return boundary_polygon_gdf
 
-    if boundary_lines:
-        return gpd.GeoDataFrame(boundary_lines, crs=boundary_gdf.crs)
     # Return empty GeoDataFrame with same structure
     return gpd.GeoDataFrame(columns=boundary_gdf.columns, crs=boundary_gdf.crs)
 
@@ -139,35 +282,32 @@ def create_stations_csv(points_gdf: gpd.GeoDataFrame, endpoint_name: str) -> pd.
     Returns:
         DataFrame ready for CSV export with Google My Maps compatible column names
     """
-    stations_df: gpd.GeoDataFrame = points_gdf.copy()
-
-    # Create basic latitude/longitude columns (lowercase) for Google My Maps
-    stations_df["latitude"] = stations_df.geometry.y
-    stations_df["longitude"] = stations_df.geometry.x
-
-    # Create generic station names (lowercase 'name' column)
-    stations_df["name"] = f"{endpoint_name} Station"
-
     # Create description field using station_label directly
     # Map endpoint names to human-readable rail types
     rail_type_map: dict[str, str] = {"SUBWAY_LIGHTRAIL": "Subway", "TRAM": "Tram", "COMMUTER_RAIL": "Commuter Rail"}
     rail_type: str = rail_type_map.get(endpoint_name, endpoint_name)
     fallback_description: str = f"Unknown {rail_type} Station"
 
-    if "station_label" in stations_df.columns:
+    description: Any
+    if "station_label" in points_gdf.columns:
         # Use station_label value directly, fallback to rail-type specific description
-        def _station_label_application_func(x: Any) -> str:  # noqa: ANN401
-            if pd.notna(x) and str(x).strip() != "":
-                return str(x).strip()
-            return fallback_description
-
-        stations_df["Description"] = stations_df["station_label"].apply(_station_label_application_func)
+        station_labels: pd.Series = points_gdf["station_label"].astype(str).str.strip()
+        has_label: pd.Series = points_gdf["station_label"].notna() & (station_labels != "")
+        description = station_labels.where(has_label, fallback_description).to_numpy()
     else:
-        stations_df["Description"] = fallback_description
-
-    # Select Google My Maps compatible columns (include Description for station names)
-    google_columns: list[str] = ["name", "latitude", "longitude", "Description"]
-    return stations_df[google_columns]  # pyright: ignore[reportReturnType]
+        description = fallback_description
+
+    # Build only the Google My Maps compatible columns instead of copying the whole GeoDataFrame
+    geometries = points_gdf.geometry.to_numpy()
+    return pd.DataFrame(
+        {
+            "name": f"{endpoint_name} Station",  # Generic station names (lowercase 'name' column)
+            "latitude": shapely.get_y(geometries),  # pyright: ignore[reportUnknownMemberType]
+            "longitude": shapely.get_x(geometries),  # pyright: ignore[reportUnknownMemberType]
+            "Description": description,
+        },
+        index=points_gdf.index,
+    )
 
 
 def split_multi_line_entries(lines_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -179,38 +319,33 @@ def split_multi_line_entries(lines_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     Returns:
         GeoDataFrame with each line as a separate row
     """
-    expanded_rows: list[pd.Series] = []
-
-    for _idx, row in lines_gdf.iterrows():
-        # Extract all line names from dbg_lines or lines field
-        line_names: list[str] = []
-
-        if "dbg_lines" in row and pd.notna(row["dbg_lines"]):
-            dbg_lines_value: Any = row["dbg_lines"]
-            if str(dbg_lines_value).strip() != "":  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-                line_names = [name.strip() for name in str(dbg_lines_value).split(",")]  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-        elif "lines" in row and pd.notna(row["lines"]):
-            lines_value: Any = row["lines"]
-            lines_str: str = str(lines_value)  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-            labels: list[str] = re.findall(r'"label":\s*"([^"]+)"', lines_str)
-            line_names = [label.strip() for label in labels]
-
-        # If no line names found, use fallback
-        if not line_names:
-            line_names = ["Unknown Line"]
-
-        # Create a separate row for each line name
-        for line_name in line_names:
-            new_row: pd.Series = row.copy()
-            # Update the dbg_lines field to contain only this specific line
-            if "dbg_lines" in new_row:
-                new_row["dbg_lines"] = line_name
-            expanded_rows.append(new_row)
-
-    # Create new GeoDataFrame from expanded rows
-    if expanded_rows:
-        return gpd.GeoDataFrame(expanded_rows, crs=lines_gdf.crs)
-    return lines_gdf.copy()
+    if lines_gdf.empty:
+        return lines_gdf.copy()
+
+    # Extract all line names per row from dbg_lines or lines field, defaulting to the fallback name
+    line_names: pd.Series = pd.Series([["Unknown Line"]] * len(lines_gdf), index=lines_gdf.index, dtype=object)
+    has_dbg_lines: pd.Series = pd.Series(data=False, index=lines_gdf.index)
+
+    if "dbg_lines" in lines_gdf.columns:
+        dbg_lines: pd.Series = lines_gdf["dbg_lines"]
+        dbg_lines_str: pd.Series = dbg_lines.astype(str)
+        has_dbg_lines = dbg_lines.notna()
+        line_names = line_names.mask(has_dbg_lines & (dbg_lines_str.str.strip() != ""), dbg_lines_str.str.split(","))
+
+    if "lines" in lines_gdf.columns:
+        lines_col: pd.Series = lines_gdf["lines"]
+        labels: pd.Series = lines_col.astype(str).str.findall(_LABEL_RE)
+        line_names = line_names.mask(~has_dbg_lines & lines_col.notna() & (labels.str.len() > 0), labels)
+
+    # Repeat each row once per line name, keeping the original index labels
+    positions: pd.Index = pd.RangeIndex(len(lines_gdf)).repeat(line_names.str.len().to_numpy())
+    expanded_lines: gpd.GeoDataFrame = lines_gdf.iloc[positions].copy()  # pyright: ignore[reportAssignmentType]
+
+    # Update the dbg_lines field so each row holds only its specific line
+    if "dbg_lines" in expanded_lines.columns:
+        expanded_lines["dbg_lines"] = line_names.explode().str.strip().to_numpy()
+
+    return expanded_lines
 
 
 def create_lines_csv(lines_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
@@ -223,11 +358,15 @@ def create_lines_csv(lines_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
         DataFrame ready for CSV export with each line as a separate entry
     """
     # First split multi-line entries into separate rows
-    expanded_lines: gpd.GeoDataFrame = split_multi_line_entries(lines_gdf)
+    return _create_lines_csv_from_expanded(split_multi_line_entries(lines_gdf))
 
+
+def _create_lines_csv_from_expanded(expanded_lines: gpd.GeoDataFrame) -> pd.DataFrame:
+    """Create the lines CSV DataFrame from lines already split by split_multi_line_entries."""
     lines_df: gpd.GeoDataFrame = expanded_lines.copy()
-    lines_df["WKT"] = lines_df.geometry.to_wkt()
-    lines_df["name"] = lines_df.apply(extract_line_name, axis=1)
+    # Serialize all geometries in one vectorized GEOS call (same precision as GeoSeries.to_wkt)
+    lines_df["WKT"] = shapely.to_wkt(lines_df.geometry.to_numpy(), rounding_precision=6)  # pyright: ignore[reportUnknownMemberType]
+    lines_df["name"] = extract_line_names(lines_df)
 
     # Create Description column from dbg_lines or use line name
     if "dbg_lines" in lines_df.columns:
@@ -240,7 +379,98 @@ def create_lines_csv(lines_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
     return lines_df[essential_cols]  # pyright: ignore[reportReturnType]
 
 
-def create_simple_kml(gdf: gpd.GeoDataFrame, name: str, output_file: Path) -> None:  # noqa: C901
+# Schema fields exactly like the working Google My Maps file
+_KML_SCHEMA_FIELDS: str = (
+    '\t<SimpleField name="component" type="int"></SimpleField>\n'
+    '\t<SimpleField name="dbg_lines" type="string"></SimpleField>\n'
+    '\t<SimpleField name="deg" type="string"></SimpleField>\n'
+    '\t<SimpleField name="deg_in" type="string"></SimpleField>\n'
+    '\t<SimpleField name="deg_out" type="string"></SimpleField>\n'
+    '\t<SimpleField name="excluded_conn" type="string"></SimpleField>\n'
+    '\t<SimpleField name="from" type="string"></SimpleField>\n'
+    '\t<SimpleField name="id" type="string"></SimpleField>\n'
+    '\t<SimpleField name="lines" type="string"></SimpleField>\n'
+    '\t<SimpleField name="not_serving" type="string"></SimpleField>\n'
+    '\t<SimpleField name="station_id" type="string"></SimpleField>\n'
+    '\t<SimpleField name="station_label" type="string"></SimpleField>\n'
+    '\t<SimpleField name="to" type="string"></SimpleField>\n'
+)
+
+# Placemarks buffered in memory before each write to the KML file
+_KML_PLACEMARKS_PER_WRITE: int = 1000
+
+# Placemark templates exactly like the working file (important: NO <name> tag inside Placemark!)
+_KML_POINT_TEMPLATE: str = (
+    '  <Placemark id="{name}.{placemark_num}">\n'
+    '\t<ExtendedData><SchemaData schemaUrl="#{name}">\n'
+    '\t\t<SimpleData name="component">{component}</SimpleData>\n'
+    "{dbg_lines}"
+    '\t\t<SimpleData name="deg">{deg}</SimpleData>\n'
+    '\t\t<SimpleData name="deg_in">{deg_in}</SimpleData>\n'
+    '\t\t<SimpleData name="deg_out">{deg_out}</SimpleData>\n'
+    "{excluded_conn}"
+    '\t\t<SimpleData name="id">{id}</SimpleData>\n'
+    "{station_label}"
+    "\t</SchemaData></ExtendedData>\n"
+    # Coordinate format exactly like working file (no ,0)
+    "      <Point><coordinates>{lon},{lat}</coordinates></Point>\n"
+    "  </Placemark>\n"
+)
+_KML_LINE_TEMPLATE: str = (
+    '  <Placemark id="{name}.{placemark_num}">\n'
+    '\t<ExtendedData><SchemaData schemaUrl="#{name}">\n'
+    '\t\t<SimpleData name="component">{component}</SimpleData>\n'
+    "{dbg_lines}"
+    "{from_}"
+    '\t\t<SimpleData name="id">{id}</SimpleData>\n'
+    "{to}"
+    "\t</SchemaData></ExtendedData>\n"
+    "      <LineString><coordinates>{coordinates}</coordinates></LineString>\n"
+    "  </Placemark>\n"
+)
+
+
+def _kml_column_values(gdf: gpd.GeoDataFrame, field: str, default: object) -> list[Any]:
+    """Extract a column as a plain list once, or repeat the default when the column is missing."""
+    if field in gdf.columns:
+        return gdf[field].tolist()
+    return [default] * len(gdf)
+
+
+def _kml_optional_simple_data(gdf: gpd.GeoDataFrame, field: str, *, skip_blank: bool, prefix: str = "") -> list[str]:
+    """Render a <SimpleData> element per row, or an empty string where the field has no value."""
+    if field not in gdf.columns:
+        return [""] * len(gdf)
+
+    values: pd.Series = gdf[field]
+    values_str: pd.Series = values.astype(str)
+    has_value: pd.Series = values.notna()
+    if skip_blank:
+        has_value &= values_str.str.strip() != ""
+
+    rendered: pd.Series = prefix + f'\t\t<SimpleData name="{field}">' + values_str + "</SimpleData>\n"
+    return rendered.where(has_value, "").tolist()
+
+
+def _kml_line_coordinates(gdf: gpd.GeoDataFrame, type_ids: list[int]) -> list[str]:
+    """Format every LineString's coordinates in one GEOS pass, or an empty string for other geometries."""
+    line_coordinates: list[str] = [""] * len(type_ids)
+    line_positions: list[int] = [i for i, type_id in enumerate(type_ids) if type_id == shapely.GeometryType.LINESTRING]
+    lines = gdf.geometry.to_numpy()[line_positions]
+
+    # NumPy's str cast uses the same shortest repr as Python floats, so the text matches per-vertex formatting
+    vertices: list[str] = list(map(",".join, shapely.get_coordinates(lines).astype(str).tolist()))  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
+    ends = itertools.accumulate(shapely.get_num_coordinates(lines).tolist())  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType,reportUnknownVariableType]
+
+    start: int = 0
+    for position, end in zip(line_positions, ends, strict=True):
+        line_coordinates[position] = " ".join(vertices[start:end])
+        start = end
+
+    return line_coordinates
+
+
+def create_simple_kml(gdf: gpd.GeoDataFrame, name: str, output_file: Path) -> None:
     """Create KML file matching the exact format that works with Google My Maps.
 
     Args:
@@ -248,105 +478,89 @@ def create_simple_kml(gdf: gpd.GeoDataFrame, name: str, output_file: Path) -> No
         name: Name for the KML document (should be like 'component78')
         output_file: Path where to save the KML file
     """
+    # Extract every attribute once up front instead of looking fields up on each row
+    geometries = gdf.geometry.to_numpy()
+    type_ids: list[int] = shapely.get_type_id(geometries).tolist()  # pyright: ignore[reportUnknownMemberType]
+    lons: list[float] = shapely.get_x(geometries).tolist()  # pyright: ignore[reportUnknownMemberType]
+    lats: list[float] = shapely.get_y(geometries).tolist()  # pyright: ignore[reportUnknownMemberType]
+    components: list[Any] = _kml_column_values(gdf, "component", 78)
+    degs: list[Any] = _kml_column_values(gdf, "deg", "2")
+    degs_in: list[Any] = _kml_column_values(gdf, "deg_in", "2")
+    degs_out: list[Any] = _kml_column_values(gdf, "deg_out", "2")
+    ids: list[Any] = gdf["id"].tolist() if "id" in gdf.columns else [f"generated_{idx}" for idx in gdf.index]
+    line_coordinates: list[str] = _kml_line_coordinates(gdf, type_ids)
+
+    # Only add fields that have values, exactly like working file
+    point_dbg_lines: list[str] = _kml_optional_simple_data(gdf, "dbg_lines", skip_blank=True)
+    line_dbg_lines: list[str] = _kml_optional_simple_data(gdf, "dbg_lines", skip_blank=False)
+    excluded_conns: list[str] = _kml_optional_simple_data(gdf, "excluded_conn", skip_blank=True)
+    station_labels: list[str] = _kml_optional_simple_data(
+        gdf, "station_label", skip_blank=True, prefix='\t\t<SimpleData name="station_id"></SimpleData>\n'
+    )
+    line_froms: list[str] = _kml_optional_simple_data(gdf, "from", skip_blank=False)
+    line_tos: list[str] = _kml_optional_simple_data(gdf, "to", skip_blank=False)
+
     with output_file.open("w", encoding="utf-8") as f:
-        f.write('<?xml version="1.0" encoding="utf-8" ?>\n')
-        f.write('<kml xmlns="http://www.opengis.net/kml/2.2">\n')
-        f.write('<Document id="root_doc">\n')  # Important: root_doc ID
-
-        # Schema exactly like the working file
-        f.write(f'<Schema name="{name}" id="{name}">\n')
-        f.write('\t<SimpleField name="component" type="int"></SimpleField>\n')
-        f.write('\t<SimpleField name="dbg_lines" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="deg" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="deg_in" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="deg_out" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="excluded_conn" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="from" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="id" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="lines" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="not_serving" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="station_id" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="station_label" type="string"></SimpleField>\n')
-        f.write('\t<SimpleField name="to" type="string"></SimpleField>\n')
-        f.write("</Schema>\n")
-
-        f.write(f"<Folder><name>{name}</name>\n")
+        # Important: root_doc ID, and schema exactly like the working file
+        f.write(
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            '<kml xmlns="http://www.opengis.net/kml/2.2">\n'
+            '<Document id="root_doc">\n'
+            f'<Schema name="{name}" id="{name}">\n'
+            f"{_KML_SCHEMA_FIELDS}"
+            "</Schema>\n"
+            f"<Folder><name>{name}</name>\n"
+        )
 
+        # Build placemarks in memory and write them in batches instead of one write per line
+        parts: list[str] = []
         placemark_num: int = 1
-        for idx, row in gdf.iterrows():
-            if row.geometry.geom_type == "Point":
-                # Get coordinates for point
-                coords: Any = row.geometry.coords[0]
-                lon: float = coords[0]
-                lat: float = coords[1]
-
-                f.write(f'  <Placemark id="{name}.{placemark_num}">\n')
-                # Important: NO <name> tag inside Placemark!
-
-                # Add extended data exactly like working file
-                f.write(f'\t<ExtendedData><SchemaData schemaUrl="#{name}">\n')
-                f.write(f'\t\t<SimpleData name="component">{row.get("component", 78)}</SimpleData>\n')
-
-                # Only add fields that have values, exactly like working file
-                if "dbg_lines" in row and pd.notna(row["dbg_lines"]):
-                    dbg_lines_value: Any = row["dbg_lines"]
-                    if str(dbg_lines_value).strip():  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-                        f.write(f'\t\t<SimpleData name="dbg_lines">{dbg_lines_value}</SimpleData>\n')
-
-                f.write(f'\t\t<SimpleData name="deg">{row.get("deg", "2")}</SimpleData>\n')
-                f.write(f'\t\t<SimpleData name="deg_in">{row.get("deg_in", "2")}</SimpleData>\n')
-                f.write(f'\t\t<SimpleData name="deg_out">{row.get("deg_out", "2")}</SimpleData>\n')
-
-                if "excluded_conn" in row and pd.notna(row["excluded_conn"]):
-                    excluded_conn_value: Any = row["excluded_conn"]
-                    if str(excluded_conn_value).strip():  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-                        f.write(f'\t\t<SimpleData name="excluded_conn">{excluded_conn_value}</SimpleData>\n')
-
-                f.write(f'\t\t<SimpleData name="id">{row.get("id", f"generated_{idx}")}</SimpleData>\n')
-
-                # Station fields - only if they have values
-                if "station_label" in row and pd.notna(row["station_label"]):
-                    station_label_value: Any = row["station_label"]
-                    if str(station_label_value).strip():  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
-                        f.write('\t\t<SimpleData name="station_id"></SimpleData>\n')
-                        f.write(f'\t\t<SimpleData name="station_label">{station_label_value}</SimpleData>\n')
-
-                f.write("\t</SchemaData></ExtendedData>\n")
-
-                # Coordinate format exactly like working file (no ,0)
-                f.write(f"      <Point><coordinates>{lon},{lat}</coordinates></Point>\n")
-                f.write("  </Placemark>\n")
+        for i, type_id in enumerate(type_ids):
+            if type_id == shapely.GeometryType.POINT:
+                parts.append(
+                    _KML_POINT_TEMPLATE.format_map(
+                        {
+                            "name": name,
+                            "placemark_num": placemark_num,
+                            "component": components[i],
+                            "dbg_lines": point_dbg_lines[i],
+                            "deg": degs[i],
+                            "deg_in": degs_in[i],
+                            "deg_out": degs_out[i],
+                            "excluded_conn": excluded_conns[i],
+                            "id": ids[i],
+                            "station_label": station_labels[i],
+                            "lon": lons[i],
+                            "lat": lats[i],
+                        }
+                    )
+                )
                 placemark_num += 1
 
-            elif row.geometry.geom_type == "LineString":
-                # Get coordinates for line
-                coords_list: list[Any] = list(row.geometry.coords)  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType,reportUnknownVariableType]
-                coords_str: str = " ".join([f"{coord[0]},{coord[1]}" for coord in coords_list])
-
-                f.write(f'  <Placemark id="{name}.{placemark_num}">\n')
-                # No name tag
-
-                f.write(f'\t<ExtendedData><SchemaData schemaUrl="#{name}">\n')
-                f.write(f'\t\t<SimpleData name="component">{row.get("component", 78)}</SimpleData>\n')
-
-                if "dbg_lines" in row and pd.notna(row["dbg_lines"]):
-                    f.write(f'\t\t<SimpleData name="dbg_lines">{row["dbg_lines"]}</SimpleData>\n')
-
-                if "from" in row and pd.notna(row["from"]):
-                    f.write(f'\t\t<SimpleData name="from">{row["from"]}</SimpleData>\n')
-
-                f.write(f'\t\t<SimpleData name="id">{row.get("id", f"generated_{idx}")}</SimpleData>\n')
-
-                if "to" in row and pd.notna(row["to"]):
-                    f.write(f'\t\t<SimpleData name="to">{row["to"]}</SimpleData>\n')
-
-                f.write("\t</SchemaData></ExtendedData>\n")
-                f.write(f"      <LineString><coordinates>{coords_str}</coordinates></LineString>\n")
-                f.write("  </Placemark>\n")
+            elif type_id == shapely.GeometryType.LINESTRING:
+                parts.append(
+                    _KML_LINE_TEMPLATE.format_map(
+                        {
+                            "name": name,
+                            "placemark_num": placemark_num,
+                            "component": components[i],
+                            "dbg_lines": line_dbg_lines[i],
+                            "from_": line_froms[i],
+                            "id": ids[i],
+                            "to": line_tos[i],
+                            "coordinates": line_coordinates[i],
+                        }
+                    )
+                )
                 placemark_num += 1
 
-        f.write("</Folder>\n")
-        f.write("</Document></kml>\n")
+            # Flush every full batch of placemarks
+            if parts and (placemark_num - 1) % _KML_PLACEMARKS_PER_WRITE == 0:
+                f.write("".join(parts))
+                parts.clear()
+
+        parts.append("</Folder>\n</Document></kml>\n")
+        f.write("".join(parts))
 
 
 class MunichGeoJson(str, Enum):
@@ -360,7 +574,6 @@ class MunichGeoJson(str, Enum):
 
 def _setup_output_directory() -> Path:
     """Set up output directory and clear existing files."""
-    logger: Any = get_logger(__name__)
     output_dir: Path = Path("output")
     output_dir.mkdir(exist_ok=True)
     logger.info("Created output directory", path=str(output_dir))
@@ -377,7 +590,6 @@ def _setup_output_directory() -> Path:
 
 def _process_boundary_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: MunichGeoJson) -> None:
     """Process boundary data and create CSV/KML files."""
-    logger: Any = get_logger(__name__)
     boundary_polygon_gdf: gpd.GeoDataFrame = extract_boundary_polygon(gdf)
 
     if len(boundary_polygon_gdf) > 0:
@@ -403,10 +615,11 @@ def _process_boundary_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: Mu
         logger.warning("No boundary data found", endpoint=endpoint.name)
 
 
-def _process_transit_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: MunichGeoJson) -> None:
+def _process_transit_data(
+    gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: MunichGeoJson, geom_types: pd.Series | None = None
+) -> None:
     """Process transit data (stations and lines) and create CSV/KML files."""
-    logger = get_logger(__name__)
-    points_gdf, lines_gdf = separate_geometries(gdf)
+    points_gdf, lines_gdf = separate_geometries(gdf, geom_types)
     max_features = 1500  # Conservative limit to stay under 2,000 with metadata
 
     # Map endpoints to component numbers from working files
@@ -420,11 +633,12 @@ def _process_transit_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: Mun
     # Process stations
     if len(points_gdf) > 0:
         if len(points_gdf) > max_features:
+            original_count = len(points_gdf)
             points_gdf = points_gdf.head(max_features)
             logger.warning(
                 "Truncated stations for Google My Maps compatibility",
                 endpoint=endpoint.name,
-                original_count=len(gdf[gdf.geometry.geom_type == "Point"]),  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType,reportUnknownVariableType]
+                original_count=original_count,
                 truncated_count=len(points_gdf),
             )
 
@@ -450,22 +664,25 @@ def _process_transit_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: Mun
     # Process lines
     if len(lines_gdf) > 0:
         if len(lines_gdf) > max_features:
+            original_count = len(lines_gdf)
             lines_gdf = lines_gdf.head(max_features)
             logger.warning(
                 "Truncated lines for Google My Maps compatibility",
                 endpoint=endpoint.name,
-                original_count=len(gdf[gdf.geometry.geom_type == "LineString"]),  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType,reportUnknownVariableType]
+                original_count=original_count,
                 truncated_count=len(lines_gdf),
             )
 
+        # Split multi-line entries once and share the result between CSV and KML
+        expanded_lines = split_multi_line_entries(lines_gdf)
+
         # Create and save CSV
-        lines_clean = create_lines_csv(lines_gdf)
+        lines_clean = _create_lines_csv_from_expanded(expanded_lines)
         lines_csv = output_dir / f"munich_{endpoint.name.lower()}_lines.csv"
         lines_clean.to_csv(lines_csv, index=False)
 
         # Create and save simplified KML (use split lines for consistency)
         lines_kml = output_dir / f"munich_{endpoint.name.lower()}_lines_google.kml"
-        expanded_lines = split_multi_line_entries(lines_gdf)
         create_simple_kml(expanded_lines, component_name, lines_kml)
 
         logger.info(
@@ -479,30 +696,25 @@ def _process_transit_data(gdf: gpd.GeoDataFrame, output_dir: Path, endpoint: Mun
         )
 
 
-def _process_endpoint(endpoint: MunichGeoJson, output_dir: Path, i: int, total_endpoints: int) -> None:
+def _process_endpoint(endpoint: MunichGeoJson, client: httpx.Client, output_dir: Path) -> None:
     """Process a single endpoint and create output files."""
-    logger = get_logger(__name__)
-    logger.info("Fetching endpoint data", endpoint=endpoint.name, progress=f"{i}/{total_endpoints}", url=endpoint.value)
+    logger.info("Fetching endpoint data", endpoint=endpoint.name, url=endpoint.value)
 
     try:
-        # Fetch GeoJSON data from URL
-        geojson_data = fetch_geojson_data(endpoint.value)
+        # Fetch GeoJSON data over the shared pooled client
+        geojson_data = fetch_geojson_bytes(endpoint.value, client=client, cache_dir=_HTTP_CACHE_DIR)
         logger.info(
             "Successfully fetched data",
             endpoint=endpoint.name,
             content_length=len(geojson_data),
         )
 
-        # Create a temporary file to save the GeoJSON
-        temp_geojson = output_dir / f"temp_{endpoint.name.lower()}.geojson"
-        with temp_geojson.open("w", encoding="utf-8") as f:
-            f.write(geojson_data)
-
-        # Load GeoJSON with geopandas
-        gdf = gpd.read_file(temp_geojson)  # pyright: ignore[reportUnknownMemberType]
+        # Load GeoJSON with geopandas (pyogrio reads features in bulk through GDAL instead of per-feature via Fiona)
+        gdf = gpd.read_file(io.BytesIO(geojson_data), engine="pyogrio")  # pyright: ignore[reportUnknownMemberType]
 
-        # Analyze geometry types
-        geometry_types = gdf.geometry.geom_type.value_counts().to_dict()  # pyright: ignore[reportUnknownMemberType]
+        # Analyze geometry types once and reuse them when separating points from lines
+        geom_types: pd.Series = gdf.geometry.geom_type
+        geometry_types = geom_types.value_counts().to_dict()  # pyright: ignore[reportUnknownMemberType]
 
         logger.info(
             "Loaded GeoJSON data",
@@ -512,8 +724,8 @@ def _process_endpoint(endpoint: MunichGeoJson, output_dir: Path, i: int, total_e
             geometry_types=geometry_types,
         )
 
-        # Convert to WGS84 if needed
-        if gdf.crs != "EPSG:4326":
+        # Convert to WGS84 only if the source CRS isn't already equivalent (e.g. OGC:CRS84 differs only in axis order)
+        if gdf.crs is None or not gdf.crs.equals("EPSG:4326", ignore_axis_order=True):
             gdf = gdf.to_crs("EPSG:4326")
             logger.info("Converted CRS to WGS84", endpoint=endpoint.name)
 
@@ -521,11 +733,7 @@ def _process_endpoint(endpoint: MunichGeoJson, output_dir: Path, i: int, total_e
         if endpoint.name == "BOUNDARY":
             _process_boundary_data(gdf, output_dir, endpoint)
         else:
-            _process_transit_data(gdf, output_dir, endpoint)
-
-        # Clean up temporary file
-        temp_geojson.unlink()
-        logger.debug("Cleaned up temporary file", temp_file=str(temp_geojson))
+            _process_transit_data(gdf, output_dir, endpoint, geom_types)
 
     except httpx.RequestError as e:
         logger.exception(
@@ -545,7 +753,7 @@ def _process_endpoint(endpoint: MunichGeoJson, output_dir: Path, i: int, total_e
 
 def main() -> None:
     """Main function to process Munich GeoJSON data and create KML files."""
-    logger = get_logger(__name__)
+    ensure_logging_configured()
     logger.info("Starting Munich GeoJSON to KML conversion")
 
     output_dir = _setup_output_directory()
@@ -554,8 +762,18 @@ def main() -> None:
     total_endpoints = len(MunichGeoJson)
     logger.info("Processing endpoints", total_count=total_endpoints)
 
-    for i, endpoint in enumerate(MunichGeoJson, 1):
-        _process_endpoint(endpoint, output_dir, i, total_endpoints)
+    # Run each endpoint's fetch -> parse -> write pipeline in its own thread so the network I/O overlaps
+    with httpx.Client() as client, ThreadPoolExecutor(max_workers=total_endpoints) as executor:
+        endpoint_futures: dict[Future[None], MunichGeoJson] = {
+            executor.submit(_process_endpoint, endpoint, client, output_dir): endpoint for endpoint in MunichGeoJson
+        }
+        for completed, endpoint_future in enumerate(as_completed(endpoint_futures), 1):
+            endpoint_future.result()
+            logger.info(
+                "Finished endpoint",
+                endpoint=endpoint_futures[endpoint_future].name,
+                progress=f"{completed}/{total_endpoints}",
+            )
 
     logger.info("Conversion process completed", total_processed=total_endpoints)
 
@@ -12,11 +12,15 @@ import pytest
 from shapely.geometry import LineString, Point
 
 from core.map.main import (
+    MunichGeoJson,
+    _process_endpoint,
     create_lines_csv,
     create_simple_kml,
     create_stations_csv,
     extract_boundary_polygon,
     extract_line_name,
+    extract_line_names,
+    fetch_geojson_bytes,
     fetch_geojson_data,
     main,
     separate_geometries,
@@ -70,6 +74,38 @@ class TestExtractLineName:
         assert result == "S1"
 
 
+class TestExtractLineNames:
+    """Test vectorized extraction of line names across a whole DataFrame."""
+
+    def test_matches_row_wise_extraction(self):
+        """Should produce the same names as extract_line_name applied row by row."""
+        lines_df = pd.DataFrame(
+            {
+                "dbg_lines": ["U5", "S1, S2", "", None, None],
+                "lines": [
+                    "ignored",
+                    "ignored",
+                    '[{"label": "U3"}]',
+                    '[{"label": " T17 "}, {"label": "T18"}]',
+                    None,
+                ],
+            }
+        )
+
+        result = extract_line_names(lines_df)
+
+        assert result.tolist() == ["U5", "S1", "U3", "T17", "Unknown Line"]
+        assert result.tolist() == lines_df.apply(extract_line_name, axis=1).tolist()
+
+    def test_falls_back_to_unknown_line_without_name_columns(self):
+        """Should name every row 'Unknown Line' when neither dbg_lines nor lines exist."""
+        lines_df = pd.DataFrame({"other": [1, 2]})
+
+        result = extract_line_names(lines_df)
+
+        assert result.tolist() == ["Unknown Line", "Unknown Line"]
+
+
 class TestFetchGeojsonData:
     """Test fetching GeoJSON data from URLs."""
 
@@ -99,6 +135,89 @@ class TestFetchGeojsonData:
         with pytest.raises(httpx.RequestError):
             fetch_geojson_data("https://example.com/data.json")
 
+    @patch("core.map.main.httpx.Client")
+    def test_fetches_bytes_with_shared_client(self, mock_client_class):
+        """Should return raw response bytes and reuse a provided client instead of opening a new one."""
+        mock_response = Mock()
+        mock_response.content = b'{"type": "FeatureCollection"}'
+        mock_response.raise_for_status.return_value = None
+
+        shared_client = Mock()
+        shared_client.get.return_value = mock_response
+
+        result = fetch_geojson_bytes("https://example.com/data.json", client=shared_client)
+
+        assert result == b'{"type": "FeatureCollection"}'
+        shared_client.get.assert_called_once_with("https://example.com/data.json", timeout=30.0, headers={})
+        mock_client_class.assert_not_called()
+
+    @patch("core.map.main.httpx.Client")
+    def test_revalidates_cached_bytes_with_etag(self, mock_client_class, tmp_path):
+        """Should store a response with an ETag and serve it from disk when the server answers 304."""
+        fresh_response = Mock()
+        fresh_response.status_code = 200
+        fresh_response.content = b'{"type": "FeatureCollection"}'
+        fresh_response.headers = {"ETag": '"abc123"'}
+        fresh_response.raise_for_status.return_value = None
+
+        not_modified_response = Mock()
+        not_modified_response.status_code = 304
+
+        shared_client = Mock()
+        shared_client.get.side_effect = [fresh_response, not_modified_response]
+
+        url = "https://example.com/data.json"
+        first = fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+        second = fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+
+        assert first == second == b'{"type": "FeatureCollection"}'
+        assert shared_client.get.call_args_list[0].kwargs["headers"] == {}
+        assert shared_client.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc123"'}
+        not_modified_response.raise_for_status.assert_not_called()
+        mock_client_class.assert_not_called()
+
+    def test_revalidates_cached_bytes_with_last_modified(self, tmp_path):
+        """Should send If-Modified-Since from a stored Last-Modified header and reuse the body on 304."""
+        last_modified = "Wed, 01 Oct 2025 12:00:00 GMT"
+        fresh_response = Mock()
+        fresh_response.status_code = 200
+        fresh_response.content = b'{"type": "FeatureCollection"}'
+        fresh_response.headers = {"Last-Modified": last_modified}
+
+        not_modified_response = Mock()
+        not_modified_response.status_code = 304
+
+        shared_client = Mock()
+        shared_client.get.side_effect = [fresh_response, not_modified_response]
+
+        url = "https://example.com/data.json"
+        first = fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+        second = fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+
+        assert first == second == b'{"type": "FeatureCollection"}'
+        assert shared_client.get.call_args_list[1].kwargs["headers"] == {"If-Modified-Since": last_modified}
+
+    def test_treats_corrupt_cache_metadata_as_miss(self, tmp_path):
+        """Should fetch unconditionally and rewrite the cache when the stored validators are unreadable."""
+        fresh_response = Mock()
+        fresh_response.status_code = 200
+        fresh_response.content = b'{"type": "FeatureCollection"}'
+        fresh_response.headers = {"ETag": '"abc123"'}
+
+        shared_client = Mock()
+        shared_client.get.return_value = fresh_response
+
+        url = "https://example.com/data.json"
+        fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+        (validators_path,) = tmp_path.glob("*.json")
+        validators_path.write_text("{not json", encoding="utf-8")
+
+        result = fetch_geojson_bytes(url, client=shared_client, cache_dir=tmp_path)
+
+        assert result == b'{"type": "FeatureCollection"}'
+        assert shared_client.get.call_args_list[1].kwargs["headers"] == {}
+        assert json.loads(validators_path.read_text(encoding="utf-8")) == {"etag": '"abc123"'}
+
 
 class TestSeparateGeometries:
     """Test separation of mixed geometries into points and lines."""
@@ -244,6 +363,22 @@ class TestExtractBoundaryLine:
         # The boundary should have more area (from the larger polygon)
         assert result.iloc[0].geometry.area > 0.01
 
+    def test_skips_non_polygon_rows(self):
+        """Should drop non-polygon geometries while keeping polygon rows and their attributes."""
+        from shapely.geometry import Polygon
+
+        polygon = Polygon([(11.0, 48.0), (11.1, 48.0), (11.1, 48.1), (11.0, 48.1), (11.0, 48.0)])
+        data = {"geometry": [Point(11.5, 48.1), polygon], "name": ["Center", "Munich"], "osm_id": [1, 2]}
+        boundary_gdf = gpd.GeoDataFrame(data, crs="EPSG:4326")
+
+        result = extract_boundary_polygon(boundary_gdf)
+
+        assert len(result) == 1
+        assert result.iloc[0].geometry.equals(polygon)
+        assert result.iloc[0]["osm_id"] == 2
+        assert result.iloc[0]["name"] == "Munich Boundary"
+        assert result.crs == boundary_gdf.crs
+
     def test_creates_polygon_wkt_for_google_maps_tinting(self):
         """Should create POLYGON WKT format for Google My Maps area tinting."""
         from shapely.geometry import Polygon
@@ -309,6 +444,38 @@ class TestCreateSimpleKml:
             # Should have proper coordinate format
             assert "<coordinates>11.5805420781,48.2877380552</coordinates>" in content
 
+    def test_writes_line_placemarks_with_optional_fields(self):
+        """Should emit LineString placemarks with only the attributes that have values."""
+        data = {
+            "geometry": [LineString([(11.5, 48.1), (11.6, 48.2)]), LineString([(11.7, 48.3), (11.8, 48.4)])],
+            "component": [78, 78],
+            "dbg_lines": ["S1", None],
+            "from": ["0x1", None],
+            "id": ["0xa", "0xb"],
+            "to": ["0x2", None],
+        }
+        lines_gdf = gpd.GeoDataFrame(data, crs="EPSG:4326")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = Path(temp_dir) / "test.kml"
+            create_simple_kml(lines_gdf, "component78", output_file)
+
+            content = output_file.read_text(encoding="utf-8")
+
+        first_start = content.find('<Placemark id="component78.1">')
+        second_start = content.find('<Placemark id="component78.2">')
+        first_placemark = content[first_start:second_start]
+        second_placemark = content[second_start : content.find("</Placemark>", second_start)]
+
+        assert '<SimpleData name="dbg_lines">S1</SimpleData>' in first_placemark
+        assert '<SimpleData name="from">0x1</SimpleData>' in first_placemark
+        assert '<SimpleData name="to">0x2</SimpleData>' in first_placemark
+        assert "<LineString><coordinates>11.5,48.1 11.6,48.2</coordinates></LineString>" in first_placemark
+        assert "dbg_lines" not in second_placemark
+        assert '<SimpleData name="from">' not in second_placemark
+        assert '<SimpleData name="id">0xb</SimpleData>' in second_placemark
+        assert content.endswith("</Folder>\n</Document></kml>\n")
+
 
 class TestCreateLinesCsv:
     """Test creation of lines CSV with WKT geometry and readable names."""
@@ -428,7 +595,48 @@ class TestIntegrationWithRealData:
             Path(temp_path).unlink()
 
 
-@patch("core.map.main.fetch_geojson_data")
+@patch("core.map.main.fetch_geojson_bytes", return_value=b"{}")
+class TestProcessEndpointCrs:
+    """Test CRS handling when processing a single endpoint."""
+
+    def test_keeps_crs84_data_without_reprojecting(self, mock_fetch, tmp_path):
+        """Should skip to_crs for OGC:CRS84 data and still write lon/lat coordinates."""
+        gdf = gpd.GeoDataFrame(
+            {
+                "geometry": [Point(11.5, 48.1), LineString([(11.5, 48.1), (11.6, 48.2)])],
+                "station_label": ["Marienplatz", None],
+            },
+            crs="OGC:CRS84",
+        )
+
+        with (
+            patch("core.map.main.gpd.read_file", return_value=gdf),
+            patch.object(gpd.GeoDataFrame, "to_crs") as mock_to_crs,
+        ):
+            _process_endpoint(MunichGeoJson.SUBWAY_LIGHTRAIL, Mock(), tmp_path)
+
+        mock_fetch.assert_called_once()
+        mock_to_crs.assert_not_called()
+        stations = pd.read_csv(tmp_path / "munich_subway_lightrail_stations.csv")
+        assert stations.iloc[0]["longitude"] == 11.5
+        assert stations.iloc[0]["latitude"] == 48.1
+        assert (tmp_path / "munich_subway_lightrail_lines.csv").exists()
+
+    def test_reports_missing_crs_as_processing_error(self, mock_fetch, tmp_path):
+        """Should log a processing error and write nothing when the data has no CRS."""
+        gdf = gpd.GeoDataFrame({"geometry": [Point(11.5, 48.1)]})
+
+        with (
+            patch("core.map.main.gpd.read_file", return_value=gdf),
+            patch("core.map.main.logger") as mock_logger,
+        ):
+            _process_endpoint(MunichGeoJson.SUBWAY_LIGHTRAIL, Mock(), tmp_path)
+
+        assert mock_logger.exception.call_args.args[0] == "Error processing data"
+        assert list(tmp_path.iterdir()) == []
+
+
+@patch("core.map.main.fetch_geojson_bytes")
 class TestMainFunctionIntegration:
     """Integration tests for the main() function with mocked network calls."""
 
@@ -436,7 +644,7 @@ class TestMainFunctionIntegration:
         """Should process all Munich GeoJSON endpoints."""
         # Load real fixture data
         fixture_path = Path(__file__).parent.parent / "fixtures" / "sample_subway_lightrail.geojson"
-        mock_fetch.return_value = fixture_path.read_text()
+        mock_fetch.return_value = fixture_path.read_bytes()
 
         with tempfile.TemporaryDirectory() as temp_dir, patch("core.map.main.Path") as mock_path:
             mock_path.return_value = Path(temp_dir)
@@ -446,3 +654,44 @@ class TestMainFunctionIntegration:
 
         # Should have called fetch for all endpoints (including BOUNDARY)
         assert mock_fetch.call_count == 4
+
+    def test_main_writes_each_endpoint_to_its_own_files(self, mock_fetch, tmp_path):
+        """Should write every concurrently processed endpoint's payload to that endpoint's output files."""
+        fixture_path = Path(__file__).parent.parent / "fixtures" / "sample_subway_lightrail.geojson"
+        fixture = json.loads(fixture_path.read_text(encoding="utf-8"))
+
+        payloads: dict[str, bytes] = {}
+        for endpoint in [MunichGeoJson.SUBWAY_LIGHTRAIL, MunichGeoJson.TRAM, MunichGeoJson.COMMUTER_RAIL]:
+            features = [dict(feature, properties=dict(feature["properties"])) for feature in fixture["features"]]
+            for feature in features:
+                if feature["geometry"]["type"] == "Point":
+                    feature["properties"]["station_label"] = f"{endpoint.name} stop"
+            payloads[endpoint.value] = json.dumps({"type": "FeatureCollection", "features": features}).encode()
+
+        boundary = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [[[11.4, 48.0], [11.7, 48.0], [11.7, 48.3], [11.4, 48.3], [11.4, 48.0]]],
+                    },
+                    "properties": {"name": "Munich"},
+                }
+            ],
+        }
+        payloads[MunichGeoJson.BOUNDARY.value] = json.dumps(boundary).encode()
+        mock_fetch.side_effect = lambda url, **_kwargs: payloads[url]
+
+        with patch("core.map.main.Path") as mock_path:
+            mock_path.return_value = tmp_path
+            main()
+
+        for endpoint in [MunichGeoJson.SUBWAY_LIGHTRAIL, MunichGeoJson.TRAM, MunichGeoJson.COMMUTER_RAIL]:
+            stations = pd.read_csv(tmp_path / f"munich_{endpoint.name.lower()}_stations.csv")
+            assert set(stations["Description"]) == {f"{endpoint.name} stop"}
+            assert (tmp_path / f"munich_{endpoint.name.lower()}_lines_google.kml").exists()
+
+        boundary_csv = pd.read_csv(tmp_path / "munich_boundary.csv")
+        assert boundary_csv.iloc[0]["WKT"].startswith("POLYGON")
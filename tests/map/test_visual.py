@@ -1,6 +1,7 @@
 """Test Munich basemap rendering with boundary overlay."""
 
 import json
+from pathlib import Path
 import random
 from typing import Any
 
@@ -19,6 +20,9 @@ from core.map.main import (
     separate_geometries,
 )
 
+# Persist basemap tiles across runs so repeated snapshot runs don't refetch them from CartoDB
+CONTEXTILY_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "contextily"
+
 # Set random seeds for consistent cross-platform results
 random.seed(42)
 np.random.seed(42)
@@ -75,7 +79,14 @@ def snapshot_png(snapshot: Any) -> Any:
     return snapshot.use_extension(PNGImageSnapshotExtension)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session", autouse=True)
+def contextily_tile_cache() -> None:
+    """Point contextily at the persistent tile cache only when the basemap tests actually run."""
+    CONTEXTILY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    ctx.set_cache_dir(str(CONTEXTILY_CACHE_DIR))
+
+
+@pytest.fixture(scope="module")
 def munich_boundary_data() -> gpd.GeoDataFrame:
     """Load Munich boundary data for testing."""
     # Fetch Munich boundary data
@@ -85,7 +96,7 @@ def munich_boundary_data() -> gpd.GeoDataFrame:
     return extract_boundary_polygon(boundary_gdf)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def munich_subway_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     """Load Munich subway (U-Bahn) data for testing."""
     geojson_text: str = fetch_geojson_data(MunichGeoJson.SUBWAY_LIGHTRAIL.value)
@@ -97,7 +108,7 @@ def munich_subway_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     return stations_gdf, lines_gdf
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def munich_tram_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     """Load Munich tram data for testing."""
     geojson_text: str = fetch_geojson_data(MunichGeoJson.TRAM.value)
@@ -109,7 +120,7 @@ def munich_tram_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     return stations_gdf, lines_gdf
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def munich_commuter_rail_data() -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
     """Load Munich commuter rail (S-Bahn) data for testing."""
     geojson_text: str = fetch_geojson_data(MunichGeoJson.COMMUTER_RAIL.value)
@@ -0,0 +1,64 @@
+"""Behavior-driven tests for structured logging configuration."""
+
+from collections.abc import Iterator
+import json
+import logging
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from core.logging import configure_logging, ensure_logging_configured
+import core.map.main as map_main
+
+
+@pytest.fixture()
+def restore_logging() -> Iterator[None]:
+    """Restore the console logging configuration used by the rest of the test session."""
+    yield
+    configure_logging(level="INFO", format_json=False)
+
+
+class TestConfigureLogging:
+    """Test that logging configuration applies to already-created loggers."""
+
+    @pytest.mark.usefixtures("restore_logging")
+    def test_module_logger_follows_reconfiguration(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Should render with the new configuration after a module logger has already logged once."""
+        configure_logging(level="INFO", format_json=False)
+        map_main.logger.info("first message")
+        capsys.readouterr()
+
+        configure_logging(level="INFO", format_json=True)
+        map_main.logger.info("second message")
+
+        output_lines = capsys.readouterr().out.strip().splitlines()
+        record = json.loads(output_lines[-1])
+        inner_record = json.loads(record["event"])
+        assert inner_record["event"] == "second message"
+
+
+class TestEnsureLoggingConfigured:
+    """Test that logging is only configured by entry points, never on import."""
+
+    def test_import_does_not_install_root_handler(self) -> None:
+        """Should leave the root logger untouched when core.logging is merely imported."""
+        code = "import logging, core.logging; raise SystemExit(len(logging.getLogger().handlers))"
+        repo_root = Path(__file__).resolve().parents[1]
+
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo_root, check=False)
+
+        assert result.returncode == 0
+
+    @pytest.mark.usefixtures("restore_logging")
+    def test_keeps_explicit_configuration(self) -> None:
+        """Should not replace handlers or level set by an earlier explicit configure_logging call."""
+        configure_logging(level="DEBUG", format_json=True)
+        root_logger = logging.getLogger()
+        handlers_before = list(root_logger.handlers)
+
+        ensure_logging_configured()
+
+        assert root_logger.handlers == handlers_before
+        assert root_logger.level == logging.DEBUG